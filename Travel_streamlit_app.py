@@ -1,10 +1,25 @@
 import streamlit as st
 import asyncio
-import aiohttp
-import json
-import google.generativeai as genai
-from datetime import datetime, timedelta
+import html
+import orjson
+from collections import deque
+from datetime import date, datetime, timedelta
+import threading
 import time
+from urllib.parse import quote
+
+try:
+    import uvloop
+except ImportError:  # optional, and not available on Windows
+    uvloop = None
+
+from constants import (
+    AIRLINE_LOGOS, AIRPORT_CODES, CITY_RE, CITY_TO_IATA, CLASS_OR_BUDGET_RE, CUSTOM_CSS,
+    DATE_RE, DIRECTION_RE, EXTRACTION_INSTRUCTIONS, FIELD_PROMPTS, FLIGHT_PAYLOAD_TEMPLATE,
+    HEADER_HTML, HOTEL_CHAINS, ONE_WAY_RE, PARTNER_LOGOS_HTML, PLACE_RE,
+    RECOMMENDATION_INSTRUCTIONS, REQUIRED_FIELDS, ROUND_TRIP_REQUIRED_FIELDS, ROUTE_RE,
+    STAR_RATINGS, TRAVELERS_BY_COUNT, TRAVELERS_RE, TRAVELER_WORDS_RE, TRIP_FIELDS, TRIP_SCHEMA
+)
 
 # Streamlit page configuration MUST BE FIRST
 st.set_page_config(
@@ -14,10 +29,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Only the most recent messages are kept, so each rerun renders a bounded thread
+MAX_CONVERSATION_MESSAGES = 40
+
 # Initialize session state
 def init_session_state():
     session_defaults = {
-        'conversation': [],
+        'conversation': deque(maxlen=MAX_CONVERSATION_MESSAGES),
         'trip_details': {
             "origin": "",
             "destination": "",
@@ -37,156 +55,99 @@ def init_session_state():
         },
         'awaiting_input_for': None
     }
-    
-    for key, value in session_defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+
+    st.session_state.update(
+        {key: value for key, value in session_defaults.items() if key not in st.session_state}
+    )
 
 init_session_state()
 
-# Configure Gemini
-genai.configure(api_key=st.secrets.get("GEMINI_API_KEY"))
-model = genai.GenerativeModel(model_name="models/gemini-1.5-flash")
+# Configure Gemini once per process rather than on every rerun
+@st.cache_resource
+def get_model(system_instruction=None):
+    # Imported here so the first page render doesn't pay for the SDK's import
+    import google.generativeai as genai
+
+    genai.configure(api_key=st.secrets.get("GEMINI_API_KEY"))
+    return genai.GenerativeModel(
+        model_name="models/gemini-1.5-flash",
+        system_instruction=system_instruction
+    )
 
 # API Credentials
 AMADEUS_API_KEY = st.secrets.get("AMADEUS_API_KEY")
 AMADEUS_API_SECRET = st.secrets.get("AMADEUS_API_SECRET")
+AMADEUS_BASE_URL = "https://test.api.amadeus.com"
 
-# Verified image sources
-AIRLINE_LOGOS = {
-    "AI": "https://www.airindia.com/content/dam/air-india/airindia-revamp/logos/AI_Logo_Red_New.svg",
-    "6E": "https://www.goindigo.in/content/dam/s6web/in/en/assets/logo/IndiGo_logo_2x.png",
-    "SG": "https://www.spicejet.com/v1.svg",
-    "default": "https://cdn-icons-png.flaticon.com/512/1169/1169168.png"
-}
-
-HOTEL_CHAINS = {
-    "Marriott": "https://logos-world.net/wp-content/uploads/2021/08/Marriott-Logo.png",
-    "Hilton": "https://logos-world.net/wp-content/uploads/2021/02/Hilton-Logo.png",
-    "default": "https://cdn-icons-png.flaticon.com/512/2969/2969446.png"
-}
-
-PARTNER_LOGOS = [
-    {"name": "Air India", "url": "https://www.airindia.com/content/dam/air-india/airindia-revamp/logos/AI_Logo_Red_New.svg"},
-    {"name": "IndiGo", "url": "https://www.goindigo.in/content/dam/s6web/in/en/assets/logo/IndiGo_logo_2x.png"},
-    {"name": "SpiceJet", "url": "https://www.spicejet.com/v1.svg"},
-    {"name": "Marriott", "url": "https://logos-world.net/wp-content/uploads/2021/08/Marriott-Logo.png"}
-]
-
-AIRPORT_CODES = {
-    "DEL": "Delhi", "BOM": "Mumbai", "GOI": "Goa",
-    "BLR": "Bangalore", "HYD": "Hyderabad", "CCU": "Kolkata",
-    "MAA": "Chennai", "JFK": "New York", "LHR": "London",
-    "MCT": "Muscat"
-}
-
-# Custom CSS
-st.markdown("""
-<style>
-    .main {
-        background-color: #f5f9ff;
-    }
-    .user-message {
-        background-color: #4a8cff;
-        color: white;
-        border-radius: 15px 15px 0 15px;
-        padding: 12px 16px;
-        margin: 8px 0;
-        max-width: 80%;
-        margin-left: auto;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .assistant-message {
-        background-color: #ffffff;
-        color: #333;
-        border-radius: 15px 15px 15px 0;
-        padding: 12px 16px;
-        margin: 8px 0;
-        max-width: 80%;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        border: 1px solid #e1e1e1;
-    }
-    .stTextInput>div>div>input {
-        color: #333 !important;
-        background-color: white !important;
-        border: 1px solid #ddd !important;
-        border-radius: 20px !important;
-        padding: 10px 15px !important;
-    }
-    .travel-card {
-        border: 1px solid #ddd;
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        background-color: white;
-        box-shadow: 0 2px 6px rgba(0,0,0,0.05);
-    }
-    .travel-card:hover {
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    .header {
-        background: linear-gradient(135deg, #4a8cff 0%, #2a56d6 100%);
-        color: white;
-        padding: 20px;
-        border-radius: 10px;
-        margin-bottom: 20px;
-    }
-    .price-tag {
-        background-color: #4a8cff;
-        color: white;
-        padding: 5px 10px;
-        border-radius: 15px;
-        font-weight: bold;
-        display: inline-block;
-    }
-    .rating {
-        color: #FFD700;
-        font-size: 18px;
-    }
-    .partner-logo {
-        height: 60px;
-        margin: 10px;
-        filter: grayscale(30%);
-        transition: all 0.3s ease;
-    }
-    .partner-logo:hover {
-        filter: grayscale(0%);
-        transform: scale(1.1);
-    }
-    .logo-container {
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        height: 100px;
-    }
-    .typing-indicator:after {
-        content: '...';
-        animation: typing 1s infinite;
-    }
-    @keyframes typing {
-        0% { content: '.'; }
-        33% { content: '..'; }
-        66% { content: '...'; }
-    }
-    .flight-table {
-        width: 100%;
-        margin: 10px 0;
-    }
-    .flight-table th {
-        text-align: left;
-        padding: 8px;
-        background-color: #f2f2f2;
-    }
-    .flight-table td {
-        padding: 8px;
-        border-bottom: 1px solid #ddd;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS. It has to be emitted on every run: Streamlit drops any
+# element a rerun doesn't re-create, styles included.
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Helper Functions
-async def get_amadeus_token():
-    url = "https://test.api.amadeus.com/v1/security/oauth2/token"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_DELAY = 5
+
+def retry_delay(resp, attempt, base_delay):
+    """Honour a numeric Retry-After header, otherwise back off exponentially"""
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    try:
+        return min(float(retry_after), MAX_RETRY_DELAY)
+    except (TypeError, ValueError):
+        return base_delay * 2 ** attempt
+
+async def request_with_retry(session, method, url, tries=3, base_delay=0.2, **kwargs):
+    """Send a request on one session, retrying 429/5xx responses, connection errors and timeouts.
+
+    Returns (status, parsed JSON body or None)."""
+    import aiohttp
+
+    for attempt in range(tries):
+        last_attempt = attempt == tries - 1
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                if resp.status == 200:
+                    return resp.status, await resp.json(loads=orjson.loads)
+                if resp.status not in RETRY_STATUSES or last_attempt:
+                    return resp.status, None
+                delay = retry_delay(resp, attempt, base_delay)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if last_attempt:
+                raise
+            delay = retry_delay(None, attempt, base_delay)
+        await asyncio.sleep(delay)
+
+def run_async(coro):
+    """Run a coroutine on this session's event loop, which is kept across reruns
+    so pooled connections survive between searches"""
+    if "event_loop" not in st.session_state:
+        st.session_state.event_loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    return st.session_state.event_loop.run_until_complete(coro)
+
+async def get_http_session():
+    """Return the session's pooled aiohttp client, creating it on first use"""
+    # aiohttp is only imported once a search actually runs
+    import aiohttp
+
+    session = st.session_state.get("http_session")
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            base_url=AMADEUS_BASE_URL,
+            # Bound each attempt so a stalled Amadeus call can't hang the rerun
+            timeout=aiohttp.ClientTimeout(total=8, connect=2),
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        st.session_state.http_session = session
+    return session
+
+TOKEN_EXPIRY_MARGIN = 60
+
+async def get_amadeus_token(session):
+    """Return the session's cached Amadeus token, fetching a new one when it is about to expire"""
+    cached = st.session_state.get("amadeus_token")
+    if cached and cached["expires_at"] > time.monotonic() + TOKEN_EXPIRY_MARGIN:
+        return cached
+
+    url = "/v1/security/oauth2/token"
     headers = {'Content-Type': 'application/x-www-form-urlencoded'}
     data = {
         'grant_type': 'client_credentials',
@@ -194,80 +155,109 @@ async def get_amadeus_token():
         'client_secret': AMADEUS_API_SECRET
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                st.error("Failed to get Amadeus token")
-                return None
+        status, body = await request_with_retry(session, "POST", url, headers=headers, data=data)
+        if status == 200:
+            body["expires_at"] = time.monotonic() + body.get("expires_in", 0)
+            st.session_state.amadeus_token = body
+            return body
+        st.error("Failed to get Amadeus token")
+        return None
     except Exception as e:
         st.error(f"Token error: {str(e)}")
         return None
 
-async def search_flights(payload, token):
+async def search_flights(payload, token, session, refresh=None):
+    """Search flight offers. If Amadeus rejects the token and a pending token
+    refresh is given, wait for it and retry once with the new token."""
     if not token:
         return None
         
-    url = "https://test.api.amadeus.com/v2/shopping/flight-offers"
+    url = "/v2/shopping/flight-offers"
     headers = {
         'Authorization': f"Bearer {token}",
         'Content-Type': 'application/json'
     }
+    # Encode with orjson rather than aiohttp's default stdlib json.dumps
+    data = orjson.dumps(payload)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                st.error(f"Flight search failed: {resp.status}")
-                return None
+        status, body = await request_with_retry(session, "POST", url, headers=headers, data=data)
+        if status == 401 and refresh is not None and (fresh := await refresh):
+            headers['Authorization'] = f"Bearer {fresh['access_token']}"
+            status, body = await request_with_retry(session, "POST", url, headers=headers, data=data)
+        if status == 200:
+            return body
+        st.error(f"Flight search failed: {status}")
+        return None
     except Exception as e:
         st.error(f"Search error: {str(e)}")
         return None
 
 def process_flight_data(flight_data):
-    """Process flight data to add additional information and sort by direct flights"""
-    if not flight_data or not flight_data.get('data'):
-        return None
-    
+    """Turn a flight-offers response into the top three display rows, direct flights first.
+
+    Runs once per search, so reruns of the results screen only read prepared strings."""
     processed_flights = []
     
-    for offer in flight_data['data']:
+    for offer in flight_data.get('data', []):
         # Calculate total duration
         segments = offer['itineraries'][0]['segments']
         departure = datetime.fromisoformat(segments[0]['departure']['at'])
         arrival = datetime.fromisoformat(segments[-1]['arrival']['at'])
-        duration = str(arrival - departure)
         
         # Determine if flight is direct
         is_direct = len(segments) == 1
+        economy = offer.get('class', 'ECONOMY').upper() == 'ECONOMY'
         
-        processed_flight = {
-            "offer": offer,
+        processed_flights.append({
+            "logo": AIRLINE_LOGOS.get(segments[0]['carrierCode'], AIRLINE_LOGOS['default']),
             "is_direct": is_direct,
-            "duration": duration,
-            "baggage_allowance": {
-                "carry_on": "1 x 7kg" if offer.get('class', 'ECONOMY').upper() == 'ECONOMY' else "2 x 7kg",
-                "checked": "1 x 23kg" if offer.get('class', 'ECONOMY').upper() == 'ECONOMY' else "2 x 32kg"
-            },
-            "cancellation_policy": "Free cancellation within 24 hours" if is_direct else "Varies by airline"
-        }
-        processed_flights.append(processed_flight)
+            "price": float(offer['price']['grandTotal']),
+            "segments": [
+                f"<b>{seg['departure']['iataCode']} → {seg['arrival']['iataCode']}</b> "
+                f"{seg['carrierCode']}{seg['number']} "
+                f"{seg['departure']['at'][11:16]}-{seg['arrival']['at'][11:16]}"
+                for seg in segments
+            ],
+            "details": {
+                "Duration": str(arrival - departure),
+                "Baggage Allowance": ("1 x 7kg (carry-on), 1 x 23kg (checked)" if economy
+                                      else "2 x 7kg (carry-on), 2 x 32kg (checked)"),
+                "Cancellation Policy": "Free cancellation within 24 hours" if is_direct else "Varies by airline"
+            }
+        })
     
     # Sort flights - direct flights first, then by price
-    processed_flights.sort(key=lambda x: (not x['is_direct'], float(x['offer']['price']['grandTotal'])))
+    processed_flights.sort(key=lambda x: (not x['is_direct'], x['price']))
     
     return processed_flights[:3]  # Return top 3 options
 
-async def get_hotels(destination, check_in, check_out, travelers):
-    """Simulated hotel search"""
-    city = AIRPORT_CODES.get(destination, destination)
+def process_hotel_data(hotels):
+    """Top three hotels with star strings and chain logos resolved once per search"""
+    return [
+        {
+            **hotel,
+            "stars": STAR_RATINGS[int(hotel["rating"])],
+            "chain_logo": HOTEL_CHAINS.get(hotel["chain"], HOTEL_CHAINS['default']) if hotel.get("chain") else None
+        }
+        for hotel in hotels[:3]
+    ]
+
+def city_name(code):
+    """Display name for an airport code, or the code itself if we don't know it"""
+    return AIRPORT_CODES.get(code, code)
+
+@st.cache_data(ttl=900, show_spinner=False)
+def hotels_for_city(city):
+    """Simulated hotel list, memoized per city since nothing else affects it"""
+    # Seeded photo URLs are stable, so the browser can cache them across reruns
+    seed = quote(city.lower())
     return [
         {
             "name": f"Grand {city} Hotel",
             "price": 75,
             "rating": 4.5,
             "address": f"123 Beach Road, {city}",
-            "photo": "https://source.unsplash.com/random/300x200/?hotel",
+            "photo": f"https://picsum.photos/seed/{seed}-grand/300/200",
             "chain": "Marriott"
         },
         {
@@ -275,258 +265,495 @@ async def get_hotels(destination, check_in, check_out, travelers):
             "price": 120,
             "rating": 5,
             "address": f"456 Main Street, {city}",
-            "photo": "https://source.unsplash.com/random/300x200/?luxury+hotel",
+            "photo": f"https://picsum.photos/seed/{seed}-palace/300/200",
             "chain": "Hilton"
         }
     ]
 
-def get_travel_recommendations(destination, dates):
-    city = AIRPORT_CODES.get(destination, destination)
-    prompt = f"""Provide 3-5 travel recommendations for {city} during {dates} 
-    including attractions, food, and cultural tips in a concise paragraph."""
+def get_hotels(destination, check_in, check_out, travelers):
+    """Simulated hotel search"""
+    return hotels_for_city(city_name(destination))
+
+RECOMMENDATION_TTL = 3600
+
+def travel_months(*dates):
+    """The months a trip covers, e.g. "June 2025" or "June 2025 to July 2025".
+
+    Recommendations depend on the season rather than the exact days, so prompting
+    and caching by month lets trips on different dates share one Gemini answer.
+    Falls back to the dates as given if one isn't in ISO form."""
+    dates = [d for d in dates if d]
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        months = [date.fromisoformat(d).strftime("%B %Y") for d in dates]
+    except ValueError:
+        months = dates
+    return " to ".join(dict.fromkeys(months))
+
+RECOMMENDATION_CACHE_SIZE = 256
+
+@st.cache_resource
+def recommendation_cache():
+    """Finished recommendation texts keyed by (city, travel months), shared by all sessions,
+    and the lock that guards changes to them"""
+    return {}, threading.Lock()
+
+def remember_recommendations(key, text):
+    """Cache a finished text, dropping expired entries and the oldest ones beyond the size cap"""
+    cache, lock = recommendation_cache()
+    now = time.monotonic()
+    with lock:
+        for old_key, (expires_at, _) in list(cache.items()):
+            if expires_at <= now:
+                del cache[old_key]
+        while len(cache) >= RECOMMENDATION_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = (now + RECOMMENDATION_TTL, text)
+
+def stream_recommendations(response, key):
+    """Yield Gemini's text chunks as they arrive and cache the full text once the stream ends"""
+    parts = []
+    try:
+        for chunk in response:
+            parts.append(chunk.text)
+            yield chunk.text
+    except Exception:
+        yield "\n\n(Recommendations unavailable)"
+        return
+    remember_recommendations(key, "".join(parts))
+
+def resume_stream(shown, stream):
+    """Replay the text already shown, then carry on with the rest of an interrupted stream"""
+    if shown:
+        yield shown
+    yield from stream
+
+async def get_travel_recommendations(destination, dates):
+    """Return cached recommendations as a string, or a stream of chunks for show_results to render"""
+    city = city_name(destination)
+    key = (city, dates)
+    cache, _ = recommendation_cache()
+    cached = cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    try:
+        # With stream=True the call returns at the first chunk; keep that wait off the event loop
+        response = await asyncio.to_thread(
+            get_model(RECOMMENDATION_INSTRUCTIONS).generate_content,
+            f"Destination: {city}\nDates: {dates}",
+            stream=True
+        )
+        return stream_recommendations(response, key)
     except Exception as e:
         st.error(f"Recommendation error: {str(e)}")
         return f"Top things to do in {city}:\n\n(Recommendations unavailable)"
 
-def extract_trip_details(user_input):
-    prompt = f"""Analyze this travel request: "{user_input}"
-    Extract and return ONLY valid JSON with these fields:
-    - origin (IATA code like "DEL" or empty if not mentioned)
-    - destination (IATA code like "GOI" or empty)
-    - departure_date (YYYY-MM-DD or empty)
-    - return_date (YYYY-MM-DD or empty if one-way)
-    - travelers (number or default 1)
-    - trip_type ("one-way" or "round-trip")
-    - budget (number or null)
-    - class ("economy", "business" or null)
-    
-    Example output for "I want to fly from Delhi to Goa on May 5th with 2 people":
-    {{
-        "origin": "DEL",
-        "destination": "GOI",
-        "departure_date": "2024-05-05",
-        "return_date": "",
-        "travelers": 2,
+def normalize_trip_details(details):
+    """Keep only known, non-empty trip fields and coerce them to the types the search expects"""
+    clean = {field: details[field] for field in TRIP_FIELDS if details.get(field)}
+    for field in ("origin", "destination"):
+        if field in clean:
+            clean[field] = str(clean[field]).strip().upper()
+    if "class" in clean:
+        clean["class"] = str(clean["class"]).lower()
+    if "travelers" in clean:
+        try:
+            clean["travelers"] = int(clean["travelers"])
+        except (TypeError, ValueError):
+            del clean["travelers"]
+    # Drop dates that aren't real YYYY-MM-DD dates so the user is asked for them instead
+    for field in ("departure_date", "return_date"):
+        if field in clean and iso_dates(str(clean[field])) != [clean[field]]:
+            del clean[field]
+    return clean
+
+def iso_dates(text):
+    """YYYY-MM-DD dates in the text, or None if any of them isn't a real calendar date"""
+    dates = DATE_RE.findall(text)
+    try:
+        for found in dates:
+            date.fromisoformat(found)
+    except ValueError:
+        return None
+    return dates
+
+def parse_trip_details_fast(user_input):
+    """Read plainly written requests like "DEL to BOM on 2025-06-10 for 2 people" without Gemini.
+
+    Returns None, leaving the request to Gemini, unless exactly two places and a date
+    are found and it's clear which place is the origin: "from X" and "to Y" in any
+    order, or "X to Y". Also returns None when a capitalised word isn't a known airport
+    code ("FLY", "OMR"), the request mentions a cabin class or budget, or the travelers
+    or dates can't be read unambiguously."""
+    matches = list(PLACE_RE.finditer(user_input))
+    if any(m.group(1) and m.group(1) not in AIRPORT_CODES for m in matches) or CLASS_OR_BUDGET_RE.search(user_input):
+        return None
+    dates = iso_dates(user_input)
+    if len(matches) != 2 or not dates or len(dates) > 2:
+        return None
+
+    places = {}
+    for match in matches:
+        direction = DIRECTION_RE.search(user_input[:match.start()])
+        marker = direction.group(1).lower() if direction else None
+        if marker in places:
+            return None
+        places[marker] = match.group(1) or CITY_TO_IATA[match.group(2).lower()]
+    if list(places) == [None, "to"]:
+        places["from"] = places.pop(None)
+    elif set(places) != {"from", "to"}:
+        return None
+    if places["from"] == places["to"]:
+        return None
+
+    # Every mention of who is travelling has to be a plain "N people"
+    counts = TRAVELERS_RE.findall(user_input)
+    if len(counts) > 1 or TRAVELER_WORDS_RE.search(TRAVELERS_RE.sub("", user_input)):
+        return None
+    travelers = int(counts[0]) if counts else 1
+    if not 1 <= travelers <= 9:
+        return None
+
+    details = {
+        "origin": places["from"],
+        "destination": places["to"],
+        "departure_date": dates[0],
         "trip_type": "one-way",
-        "budget": null,
-        "class": "economy"
-    }}"""
-    
+        "travelers": travelers
+    }
+    if len(dates) > 1:
+        # "one way" with two dates, or a return before departure, is for Gemini to sort out
+        if ONE_WAY_RE.search(user_input) or dates[1] < dates[0]:
+            return None
+        details["return_date"] = dates[1]
+        details["trip_type"] = "round-trip"
+    return details
+
+def parse_field_answer(field, answer):
+    """Read the reply to a single-field prompt ("DEL", "Goa", "2025-06-10") without Gemini.
+
+    Returns None when the reply doesn't contain a usable value. Fields without a
+    fixed format are taken as typed."""
+    if field in ("origin", "destination"):
+        # City names first, so "GOA" is Goa rather than an unknown code
+        if city := CITY_RE.search(answer):
+            return CITY_TO_IATA[city.group(1).lower()]
+        for code, _ in PLACE_RE.findall(answer):
+            if code in AIRPORT_CODES:
+                return code
+        # Any other code only when it's the whole reply, e.g. "goi" or "xyz", not "NOT SURE"
+        code = answer.strip().upper()
+        return code if len(code) == 3 and code.isalpha() else None
+    if field in ("departure_date", "return_date"):
+        # "2025-02-30" matches DATE_RE but isn't a date Amadeus (or travel_months) accepts
+        dates = iso_dates(answer)
+        return dates[0] if dates else None
+    return answer.strip() or None
+
+def extract_trip_details(user_input):
+    if details := parse_trip_details_fast(user_input):
+        return details
+
     try:
-        response = model.generate_content(prompt)
-        clean_json = response.text.strip().strip('```json').strip('```').strip()
-        return json.loads(clean_json)
+        response = get_model(EXTRACTION_INSTRUCTIONS).generate_content(
+            f'Travel request: "{user_input}"',
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": TRIP_SCHEMA,
+                # The reply is one small object; cap generation so it can't run long
+                "max_output_tokens": 128
+            }
+        )
+        return normalize_trip_details(orjson.loads(response.text))
     except Exception as e:
         st.error(f"Extraction error: {str(e)}")
         return None
 
+def origin_destination(leg_id, origin, destination, date):
+    return {
+        "id": leg_id,
+        "originLocationCode": origin,
+        "destinationLocationCode": destination,
+        "departureDateTimeRange": {
+            "date": date,
+            "time": "10:00:00"
+        }
+    }
+
+def traveler_list(count):
+    # Fresh dicts: the prebuilt travelers are read-only and orjson can't serialize them as-is
+    if count < len(TRAVELERS_BY_COUNT):
+        return [dict(traveler) for traveler in TRAVELERS_BY_COUNT[count]]
+    return [{"id": str(i+1), "travelerType": "ADULT"} for i in range(count)]
+
 def build_flight_payload(details):
-    payload = {
-        "currencyCode": "OMR",
-        "originDestinations": [{
-            "id": "1",
-            "originLocationCode": details["origin"],
-            "destinationLocationCode": details["destination"],
-            "departureDateTimeRange": {
-                "date": details["departure_date"],
-                "time": "10:00:00"
-            }
+    """Fill the per-trip fields around the fixed FLIGHT_PAYLOAD_TEMPLATE"""
+    origin_destinations = [
+        origin_destination("1", details["origin"], details["destination"], details["departure_date"])
+    ]
+    if details["trip_type"] == "round-trip" and details.get("return_date"):
+        origin_destinations.append(
+            origin_destination("2", details["destination"], details["origin"], details["return_date"])
+        )
+
+    flight_filters = {
+        "cabinRestrictions": [{
+            "cabin": details.get("class", "ECONOMY").upper(),
+            "coverage": "MOST_SEGMENTS",
+            "originDestinationIds": [leg["id"] for leg in origin_destinations]
         }],
-        "travelers": [{"id": str(i+1), "travelerType": "ADULT"} 
-                     for i in range(details["travelers"])],
-        "sources": ["GDS"],
-        "searchCriteria": {
-            "maxFlightOffers": 5,
-            "flightFilters": {
-                "cabinRestrictions": [{
-                    "cabin": details.get("class", "ECONOMY").upper(),
-                    "coverage": "MOST_SEGMENTS",
-                    "originDestinationIds": ["1"]
-                }],
-                "connectionRestriction": {
-                    "maxNumberOfConnections": 1
-                }
-            }
+        "connectionRestriction": {
+            "maxNumberOfConnections": 1
         }
     }
-    
-    if details["trip_type"] == "round-trip" and details.get("return_date"):
-        payload["originDestinations"].append({
-            "id": "2",
-            "originLocationCode": details["destination"],
-            "destinationLocationCode": details["origin"],
-            "departureDateTimeRange": {
-                "date": details["return_date"],
-                "time": "10:00:00"
-            }
-        })
-        payload["searchCriteria"]["flightFilters"]["cabinRestrictions"][0]["originDestinationIds"].append("2")
-    
     if details.get("budget"):
-        payload["searchCriteria"]["flightFilters"]["priceRange"] = {
+        flight_filters["priceRange"] = {
             "maxPrice": details["budget"],
             "currency": "OMR"
         }
-    
-    return payload
 
-async def process_trip():
-    st.session_state.search_in_progress = True
-    
-    # Get flights
-    token = await get_amadeus_token()
-    if token:
-        flights = await search_flights(
-            build_flight_payload(st.session_state.trip_details),
-            token["access_token"]
-        )
-        st.session_state.results["flights"] = flights
-    
-    # Get hotels
-    check_in = st.session_state.trip_details["departure_date"]
-    check_out = st.session_state.trip_details.get("return_date", 
-                (datetime.strptime(check_in, "%Y-%m-%d") + timedelta(days=3)).strftime("%Y-%m-%d"))
-    
-    st.session_state.results["hotels"] = await get_hotels(
-        st.session_state.trip_details["destination"],
-        check_in,
-        check_out,
-        st.session_state.trip_details["travelers"]
+    return {
+        **FLIGHT_PAYLOAD_TEMPLATE,
+        "originDestinations": origin_destinations,
+        "travelers": traveler_list(details["travelers"]),
+        "searchCriteria": {
+            "maxFlightOffers": 5,
+            "flightFilters": flight_filters
+        }
+    }
+
+FLIGHT_CACHE_TTL = 120
+DEFAULT_STAY = timedelta(days=3)
+
+async def process_trip(status):
+    details = st.session_state.trip_details
+
+    # Recommendations only need the destination, so start them straight away
+    dates = travel_months(details["departure_date"], details.get("return_date"))
+    recommendations_task = asyncio.create_task(
+        get_travel_recommendations(details["destination"], dates)
     )
-    
-    # Get recommendations
-    dates = st.session_state.trip_details["departure_date"]
-    if st.session_state.trip_details.get("return_date"):
-        dates += f" to {st.session_state.trip_details['return_date']}"
-    
-    st.session_state.results["recommendations"] = get_travel_recommendations(
-        st.session_state.trip_details["destination"],
-        dates
+    recommendations_task.add_done_callback(lambda _: status.write("🌴 Recommendations started"))
+
+    # The pooled session carries the token request and the flight search
+    session = await get_http_session()
+
+    # Start the token request, then build the payload while it is in flight
+    token_task = asyncio.create_task(get_amadeus_token(session))
+    await asyncio.sleep(0)
+    payload = build_flight_payload(details)
+
+    # Repeating a search within FLIGHT_CACHE_TTL reuses the earlier offers
+    if "flight_cache" not in st.session_state:
+        st.session_state.flight_cache = {}
+    flight_cache = st.session_state.flight_cache
+    cache_key = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+
+    async def fetch_flights():
+        cached = flight_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < FLIGHT_CACHE_TTL:
+            status.write("✈️ Flights fetched")
+            return cached[1]
+
+        current = st.session_state.get("amadeus_token")
+        if not token_task.done() and current and current["expires_at"] > time.monotonic():
+            # The cached token is being refreshed but hasn't expired yet, so search
+            # with it now and only wait for the refresh if Amadeus rejects it
+            flights = await search_flights(payload, current["access_token"], session, refresh=token_task)
+        else:
+            token = await token_task
+            if not token:
+                return None
+            flights = await search_flights(payload, token["access_token"], session)
+        status.write("✈️ Flights fetched")
+        if not flights:
+            return None
+        # Keep only the display rows; the raw response can be dropped right away
+        rows = process_flight_data(flights)
+        now = time.monotonic()
+        # Expired entries would never be served again, so drop them instead of letting them pile up
+        for old_key in [k for k, (fetched_at, _) in flight_cache.items() if now - fetched_at >= FLIGHT_CACHE_TTL]:
+            del flight_cache[old_key]
+        flight_cache[cache_key] = (now, rows)
+        return rows
+
+    # Hotels are a local lookup, so they are ready before any network call returns
+    check_in = details["departure_date"]
+    check_out = details.get("return_date") or (date.fromisoformat(check_in) + DEFAULT_STAY).isoformat()
+    st.session_state.results["hotels"] = process_hotel_data(get_hotels(
+        details["destination"], check_in, check_out, details["travelers"]
+    ))
+    status.write("🏨 Hotels fetched")
+
+    # token_task is included so an optimistic search doesn't leave the refresh
+    # half-finished on the loop until the next search
+    flights, recommendations, _ = await asyncio.gather(
+        fetch_flights(), recommendations_task, token_task, return_exceptions=True
     )
-    
-    st.session_state.search_in_progress = False
+
+    # A failure in one leg shouldn't throw away the other's results
+    if isinstance(flights, BaseException):
+        st.error(f"Search error: {str(flights)}")
+        flights = None
+    if isinstance(recommendations, BaseException):
+        st.error(f"Recommendation error: {str(recommendations)}")
+        recommendations = None
+
+    st.session_state.results["flights"] = flights
+    # A stream the previous results never finished showing is closed before it's replaced
+    previous = st.session_state.results["recommendations"]
+    if previous is not None and not isinstance(previous, str):
+        previous.close()
+    st.session_state.results["recommendations"] = recommendations
+
     st.session_state.current_step = "show_results"
-    st.rerun()
+
+def run_trip_search():
+    # Show the summary and typing indicator while the search runs
+    st.session_state.search_in_progress = True
+    try:
+        show_conversation()
+        with st.status("Searching for flights and hotels...") as status:
+            run_async(process_trip(status))
+            status.update(label="Search complete", state="complete")
+    finally:
+        # A failed search mustn't leave the typing indicator on for later reruns
+        st.session_state.search_in_progress = False
 
 def get_missing_fields(details):
-    required = ['origin', 'destination', 'departure_date']
-    if details.get('trip_type') == 'round-trip':
-        required.append('return_date')
+    required = ROUND_TRIP_REQUIRED_FIELDS if details.get('trip_type') == 'round-trip' else REQUIRED_FIELDS
     return [field for field in required if not details.get(field)]
 
 def get_prompt_for_field(field):
-    prompts = {
-        "origin": "Which city are you flying from? (e.g., DEL for Delhi)",
-        "destination": "Where are you flying to? (e.g., MCT for Muscat)",
-        "departure_date": "When are you departing? (YYYY-MM-DD format)",
-        "return_date": "When will you return? (YYYY-MM-DD format)",
-        "travelers": "How many people are traveling?",
-        "budget": "What's your budget (in OMR)?",
-        "class": "Preferred class? (economy/business)"
-    }
-    return prompts.get(field, f"Please provide {field.replace('_', ' ')}")
+    return FIELD_PROMPTS.get(field, f"Please provide {field.replace('_', ' ')}")
+
+def trip_summary(details, opening):
+    """Describe the trip about to be searched, with class and budget on their own lines"""
+    lines = [
+        f"{opening} from {city_name(details['origin'])} to {city_name(details['destination'])}"
+        f" on {details['departure_date']}"
+        + (f", returning {details['return_date']}" if details.get("return_date") else "")
+        + f" for {details['travelers']} traveler(s)."
+    ]
+    if details.get("class") and details["class"] != "economy":
+        lines.append(f"Class: {details['class'].title()}")
+    if details.get("budget"):
+        lines.append(f"Budget: {details['budget']} OMR")
+    return "\n".join(lines)
 
 # UI Components
 def show_partners():
     st.markdown("### Our Travel Partners")
-    cols = st.columns(len(PARTNER_LOGOS))
-    for i, partner in enumerate(PARTNER_LOGOS):
-        with cols[i]:
-            st.markdown(f'<div class="logo-container">', unsafe_allow_html=True)
-            try:
-                st.image(partner["url"], width=100, caption=partner["name"])
-            except:
-                st.markdown(f"**{partner['name']}**")
-                st.image(AIRLINE_LOGOS["default"], width=60)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-def show_conversation():
-    for msg in st.session_state.conversation:
-        role = "user" if msg['role'] == 'user' else 'assistant'
-        st.markdown(f"""
-        <div class="{role}-message">
-            {msg["content"]}
-        </div>
-        """, unsafe_allow_html=True)
-    
+    st.markdown(PARTNER_LOGOS_HTML, unsafe_allow_html=True)
+
+def message_html(role, content):
+    # Escape model output before it goes into raw HTML, keeping its line breaks
+    body = html.escape(content).replace("\n", "<br>")
+    return f'<div class="{role}-message">{body}</div>'
+
+def show_conversation(pending_reply=None):
+    # One markdown element for the whole thread instead of one per message,
+    # written into the placeholder so it can be refreshed mid-run
+    parts = [message_html(msg['role'], msg['content']) for msg in st.session_state.conversation]
+    if pending_reply:
+        parts.append(message_html("assistant", pending_reply))
     if st.session_state.search_in_progress:
-        st.markdown("""
-        <div class="assistant-message">
-            Searching for options<span class="typing-indicator"></span>
-        </div>
-        """, unsafe_allow_html=True)
+        parts.append('<div class="assistant-message">Searching for options<span class="typing-indicator"></span></div>')
+    if parts:
+        conversation_area.markdown("".join(parts), unsafe_allow_html=True)
+
+def flight_card_html(flight):
+    details = "".join(f"<tr><th>{name}</th><td>{value}</td></tr>" for name, value in flight['details'].items())
+    return (
+        '<div class="travel-card card-row">'
+        f'<div><img src="{flight["logo"]}" width="80"><br>'
+        f'<b>{"✈️ Direct" if flight["is_direct"] else "🔀 Connecting"}</b></div>'
+        f'<div><span class="price-tag">{flight["price"]:.2f} OMR</span>'
+        + "".join(f"<p>{segment}</p>" for segment in flight['segments'])
+        + f'<table class="flight-table">{details}</table></div></div>'
+    )
+
+def hotel_card_html(hotel):
+    # Hotel names and addresses include the destination as the user typed it
+    chain = f'<br><img src="{hotel["chain_logo"]}" width="100">' if hotel["chain_logo"] else ""
+    return (
+        '<div class="travel-card card-row">'
+        f'<img src="{hotel["photo"]}" width="150">'
+        f'<div><b>{html.escape(hotel["name"])}</b>'
+        f'<div class="rating">{hotel["stars"]}</div>'
+        f'<span class="price-tag">{hotel["price"]:.2f} OMR</span> per night'
+        f'<p>📍 {html.escape(hotel["address"])}</p>{chain}</div></div>'
+    )
 
 def show_results():
+    # Each list is one markdown element rather than columns of separate widgets per row
     with st.expander("✈️ Flight Options (Prices in OMR)", expanded=True):
-        if st.session_state.results["flights"]:
-            processed_flights = process_flight_data(st.session_state.results["flights"])
-            
-            if processed_flights:
-                for flight in processed_flights:
-                    offer = flight['offer']
-                    airline_code = offer['itineraries'][0]['segments'][0]['carrierCode']
-                    airline_logo = AIRLINE_LOGOS.get(airline_code, AIRLINE_LOGOS['default'])
-                    
-                    col1, col2 = st.columns([1, 3])
-                    with col1:
-                        st.image(airline_logo, width=80)
-                        st.markdown(f"**{'✈️ Direct' if flight['is_direct'] else '🔀 Connecting'}**")
-                    with col2:
-                        price = float(offer["price"]["grandTotal"])
-                        st.markdown(f"**<span class='price-tag'>{price:.2f} OMR</span>**", unsafe_allow_html=True)
-                        
-                        # Flight segments
-                        for seg in offer["itineraries"][0]["segments"]:
-                            st.write(f"**{seg['departure']['iataCode']} → {seg['arrival']['iataCode']}** "
-                                    f"{seg['carrierCode']}{seg['number']} "
-                                    f"{seg['departure']['at'][11:16]}-{seg['arrival']['at'][11:16]}")
-                        
-                        # Additional flight information in a table
-                        st.markdown("### Flight Details")
-                        flight_info = {
-                            "Duration": flight['duration'],
-                            "Baggage Allowance": f"{flight['baggage_allowance']['carry_on']} (carry-on), {flight['baggage_allowance']['checked']} (checked)",
-                            "Cancellation Policy": flight['cancellation_policy']
-                        }
-                        
-                        st.table(flight_info)
-                    st.markdown("---")
-            else:
-                st.info("No flights found. Try adjusting your search criteria.")
+        flights = st.session_state.results["flights"]
+        if flights:
+            st.markdown("".join(map(flight_card_html, flights)), unsafe_allow_html=True)
+        elif flights is not None:
+            st.info("No flights found. Try adjusting your search criteria.")
     
     with st.expander("🏨 Hotel Options"):
         if st.session_state.results["hotels"]:
-            for hotel in st.session_state.results["hotels"][:3]:
-                chain_logo = HOTEL_CHAINS.get(hotel.get("chain", ""), HOTEL_CHAINS['default'])
-                
-                col1, col2 = st.columns([1, 3])
-                with col1:
-                    st.image(hotel["photo"], width=150)
-                with col2:
-                    st.markdown(f"**{hotel['name']}**")
-                    st.markdown(f"<div class='rating'>{'⭐' * int(hotel['rating'])}{'☆' * (5 - int(hotel['rating']))}</div>", unsafe_allow_html=True)
-                    st.markdown(f"**<span class='price-tag'>{hotel['price']:.2f} OMR</span>** per night", unsafe_allow_html=True)
-                    st.markdown(f"📍 {hotel['address']}")
-                    if hotel.get("chain"):
-                        st.image(chain_logo, width=100)
-                st.markdown("---")
+            st.markdown("".join(map(hotel_card_html, st.session_state.results["hotels"])), unsafe_allow_html=True)
         else:
             st.info("No hotels found")
     
-    with st.expander("🌴 Travel Recommendations"):
-        if st.session_state.results["recommendations"]:
-            st.write(st.session_state.results["recommendations"])
+    recommendations = st.session_state.results["recommendations"]
+    streaming = recommendations is not None and not isinstance(recommendations, str)
+    with st.expander("🌴 Travel Recommendations", expanded=streaming):
+        if streaming:
+            # First render after a search: show text as Gemini produces it. If a rerun interrupts
+            # write_stream, the open stream is kept (behind what was already shown) and the next
+            # render picks it up, so partial text is never stored as the final answer.
+            received = []
+            finished = False
+
+            def collect():
+                for piece in recommendations:
+                    received.append(piece)
+                    yield piece
+
+            try:
+                st.write_stream(collect())
+                finished = True
+            finally:
+                text = "".join(received)
+                st.session_state.results["recommendations"] = (
+                    (text or None) if finished else resume_stream(text, recommendations)
+                )
+        elif recommendations:
+            st.write(recommendations)
         else:
             st.info("No recommendations available")
 
+def stream_reply(prompt):
+    """Show a chat reply in the conversation as Gemini writes it and return the full text"""
+    reply = ""
+    for chunk in get_model().generate_content(prompt, stream=True):
+        reply += chunk.text
+        show_conversation(pending_reply=reply)
+    return reply.strip()
+
 # Main App Flow
 def handle_user_input(user_input):
-    st.session_state.conversation.append({"role": "user", "content": user_input})
+    # Bound once; both are mutated in place, never replaced, during a turn
+    conversation = st.session_state.conversation
+    trip_details = st.session_state.trip_details
+    conversation.append({"role": "user", "content": user_input})
     
     try:
+        # A first message that already spells out a trip as "DEL to BOM" goes straight
+        # to the search flow instead of getting a greeting and losing the details
+        first_trip = None
+        if st.session_state.current_step == "welcome" and (route := ROUTE_RE.search(user_input)):
+            first_trip = parse_trip_details_fast(user_input)
+            if first_trip and (first_trip["origin"], first_trip["destination"]) == route.groups():
+                st.session_state.current_step = "collect_details"
+            else:
+                first_trip = None
+
         if st.session_state.current_step == "welcome":
             system_msg = (
                 "You are a friendly travel assistant named TravelEase. Greet the user warmly,"
@@ -534,126 +761,105 @@ def handle_user_input(user_input):
                 "and encourage them to describe their trip naturally. Be human and conversational."
             )
             gemini_input = system_msg + "\n\nUser: " + user_input
-            reply = model.generate_content(gemini_input).text.strip()
-            st.session_state.conversation.append({"role": "assistant", "content": reply})
+            reply = stream_reply(gemini_input)
+            conversation.append({"role": "assistant", "content": reply})
             st.session_state.current_step = "collect_details"
 
         elif st.session_state.current_step == "collect_details":
             if st.session_state.awaiting_input_for:
-                # Store the user's response for the specific field we asked for
-                st.session_state.trip_details[st.session_state.awaiting_input_for] = user_input
+                # Store the user's response for the specific field we asked for,
+                # normalised to a code or ISO date
+                field = st.session_state.awaiting_input_for
+                value = parse_field_answer(field, user_input)
+                if value is None:
+                    # Ask again instead of sending an unusable value to Amadeus
+                    conversation.append({
+                        "role": "assistant",
+                        "content": "Sorry, I couldn't read that. " + get_prompt_for_field(field)
+                    })
+                    return
+
+                trip_details[field] = value
                 st.session_state.awaiting_input_for = None
 
-                missing = get_missing_fields(st.session_state.trip_details)
+                missing = get_missing_fields(trip_details)
                 if not missing:
-                    origin_name = AIRPORT_CODES.get(st.session_state.trip_details['origin'], st.session_state.trip_details['origin'])
-                    dest_name = AIRPORT_CODES.get(st.session_state.trip_details['destination'], st.session_state.trip_details['destination'])
-
-                    summary = f"Great! ✈️ I'm searching for flights from {origin_name} to {dest_name} on {st.session_state.trip_details['departure_date']}"
-                    if st.session_state.trip_details.get("return_date"):
-                        summary += f", returning {st.session_state.trip_details['return_date']}"
-
-                    summary += f" for {st.session_state.trip_details['travelers']} traveler(s)."
-
-                    if st.session_state.trip_details.get("class") and st.session_state.trip_details["class"] != "economy":
-                        summary += f"\nClass: {st.session_state.trip_details['class'].title()}"
-
-                    if st.session_state.trip_details.get("budget"):
-                        summary += f"\nBudget: {st.session_state.trip_details['budget']} OMR"
-
-                    st.session_state.conversation.append({
+                    summary = trip_summary(trip_details, "Great! ✈️ I'm searching for flights")
+                    conversation.append({
                         "role": "assistant",
                         "content": summary + "\n\nHang tight while I look that up! 🔍"
                     })
-                    asyncio.run(process_trip())
+                    run_trip_search()
                 else:
                     next_field = missing[0]
                     st.session_state.awaiting_input_for = next_field
-                    st.session_state.conversation.append({
+                    conversation.append({
                         "role": "assistant",
                         "content": get_prompt_for_field(next_field)
                     })
             else:
-                if details := extract_trip_details(user_input):
-                    st.session_state.trip_details.update(
-                        {k: v for k, v in details.items() if v}
-                    )
-                    missing = get_missing_fields(st.session_state.trip_details)
+                # The welcome check above may already have parsed this message
+                if details := first_trip or extract_trip_details(user_input):
+                    trip_details.update(details)
+                    missing = get_missing_fields(trip_details)
                     if missing:
                         next_field = missing[0]
                         st.session_state.awaiting_input_for = next_field
-                        st.session_state.conversation.append({
+                        conversation.append({
                             "role": "assistant",
                             "content": get_prompt_for_field(next_field)
                         })
                     else:
-                        origin_name = AIRPORT_CODES.get(st.session_state.trip_details['origin'], st.session_state.trip_details['origin'])
-                        dest_name = AIRPORT_CODES.get(st.session_state.trip_details['destination'], st.session_state.trip_details['destination'])
-
-                        summary = f"Awesome! I'm finding flights from {origin_name} to {dest_name} on {st.session_state.trip_details['departure_date']}"
-                        if st.session_state.trip_details.get("return_date"):
-                            summary += f", returning {st.session_state.trip_details['return_date']}"
-
-                        summary += f" for {st.session_state.trip_details['travelers']} traveler(s)."
-
-                        if st.session_state.trip_details.get("class") and st.session_state.trip_details["class"] != "economy":
-                            summary += f" \n Class: {st.session_state.trip_details['class'].title()}"
-                        if st.session_state.trip_details.get("budget"):
-                            summary += f" \n Budget: {st.session_state.trip_details['budget']} OMR"
-
-                        st.session_state.conversation.append({
+                        summary = trip_summary(trip_details, "Awesome! I'm finding flights")
+                        conversation.append({
                             "role": "assistant",
-                            "content": f"{summary} \n Let me pull that up real quick! 🛫"
+                            "content": summary + "\n\nLet me pull that up real quick! 🛫"
                         })
-                        asyncio.run(process_trip())
+                        run_trip_search()
                 else:
                     gemini_input = f"""
                     The user said: "{user_input}"
                     You are a friendly travel assistant. If their request is unclear, gently ask for more info.
                     Suggest how to describe their trip (like cities, dates, travelers). Give examples. Be warm and casual.
                     """
-                    reply = model.generate_content(gemini_input).text.strip()
-                    st.session_state.conversation.append({"role": "assistant", "content": reply})
+                    reply = stream_reply(gemini_input)
+                    conversation.append({"role": "assistant", "content": reply})
 
         elif st.session_state.current_step == "show_results":
             if "yes" in user_input.lower() or "search" in user_input.lower():
-                st.session_state.conversation.append({
+                conversation.append({
                     "role": "assistant",
                     "content": "What would you like to search for next? 😊"
                 })
                 init_session_state()
                 st.session_state.current_step = "collect_details"
             else:
-                st.session_state.conversation.append({
+                conversation.append({
                     "role": "assistant",
                     "content": "Thank you for using TravelEase! Feel free to ask about your next adventure! 🌏"
                 })
 
-        st.rerun()
-
     except Exception as e:
         st.error(f"Error: {str(e)}")
-        st.session_state.conversation.append({
+        conversation.append({
             "role": "assistant",
             "content": "Oops! Something went wrong. Let's try that again! 🔁"
         })
         st.session_state.current_step = "collect_details"
-        st.rerun()
 
 # App Layout
-st.markdown("""
-<div class="header">
-    <h1 style="color:white; margin:0;">✈️ TravelEase Assistant</h1>
-    <p style="color:white; margin:0;">Your personal travel planning companion</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 show_partners()
+conversation_area = st.empty()
+
+# Handle new input before drawing the conversation and results, so this run
+# already shows the reply instead of needing a second st.rerun() pass.
+# st.chat_input stays pinned to the bottom of the page either way.
+if user_input := st.chat_input("Where would you like to travel?", key="chat_input"):
+    handle_user_input(user_input)
+
 show_conversation()
 
 if st.session_state.current_step == "show_results":
     show_results()
-
-# User input at bottom
-if user_input := st.chat_input("Where would you like to travel?", key="chat_input"):
-    handle_user_input(user_input)
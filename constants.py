@@ -0,0 +1,268 @@
+# Static lookup tables for the Streamlit app. Streamlit re-executes the
+# main script on every rerun, but imported modules are evaluated once per
+# process, so anything that never changes lives here. Lookup tables are
+# wrapped in MappingProxyType so they can't be mutated by accident.
+
+import re
+from types import MappingProxyType
+
+# Verified image sources
+AIRLINE_LOGOS = MappingProxyType({
+    "AI": "https://www.airindia.com/content/dam/air-india/airindia-revamp/logos/AI_Logo_Red_New.svg",
+    "6E": "https://www.goindigo.in/content/dam/s6web/in/en/assets/logo/IndiGo_logo_2x.png",
+    "SG": "https://www.spicejet.com/v1.svg",
+    "default": "https://cdn-icons-png.flaticon.com/512/1169/1169168.png"
+})
+
+HOTEL_CHAINS = MappingProxyType({
+    "Marriott": "https://logos-world.net/wp-content/uploads/2021/08/Marriott-Logo.png",
+    "Hilton": "https://logos-world.net/wp-content/uploads/2021/02/Hilton-Logo.png",
+    "default": "https://cdn-icons-png.flaticon.com/512/2969/2969446.png"
+})
+
+PARTNER_LOGOS = [
+    {"name": "Air India", "url": "https://www.airindia.com/content/dam/air-india/airindia-revamp/logos/AI_Logo_Red_New.svg"},
+    {"name": "IndiGo", "url": "https://www.goindigo.in/content/dam/s6web/in/en/assets/logo/IndiGo_logo_2x.png"},
+    {"name": "SpiceJet", "url": "https://www.spicejet.com/v1.svg"},
+    {"name": "Marriott", "url": "https://logos-world.net/wp-content/uploads/2021/08/Marriott-Logo.png"}
+]
+
+# The partner strip is one markdown element; the browser caches the logo URLs
+PARTNER_LOGOS_HTML = '<div class="logo-container">' + "".join(
+    f'<figure class="partner"><img class="partner-logo" src="{p["url"]}" alt="{p["name"]}">'
+    f'<figcaption>{p["name"]}</figcaption></figure>'
+    for p in PARTNER_LOGOS
+) + '</div>'
+
+AIRPORT_CODES = MappingProxyType({
+    "DEL": "Delhi", "BOM": "Mumbai", "GOI": "Goa",
+    "BLR": "Bangalore", "HYD": "Hyderabad", "CCU": "Kolkata",
+    "MAA": "Chennai", "JFK": "New York", "LHR": "London",
+    "MCT": "Muscat"
+})
+
+# Reverse lookup so city names typed by the user map to airport codes
+CITY_TO_IATA = MappingProxyType({city.lower(): code for code, city in AIRPORT_CODES.items()})
+
+# Known city names in any case, longest first so a longer name is never cut short
+CITY_PATTERN = "|".join(sorted(map(re.escape, CITY_TO_IATA), key=len, reverse=True))
+CITY_RE = re.compile(r"\b(" + CITY_PATTERN + r")\b", re.IGNORECASE)
+# Airport codes typed in capitals, or known city names in any case
+PLACE_RE = re.compile(r"\b(?:([A-Z]{3})|(?i:(" + CITY_PATTERN + r")))\b")
+DATE_RE = re.compile(r"\b(20\d{2}-\d{2}-\d{2})\b")
+TRAVELERS_RE = re.compile(r"\b(\d+)\s*(?:people|persons|travell?ers|adults|pax)\b", re.IGNORECASE)
+# Any other way of saying who is travelling ("two people", "family of 4", "with my wife")
+TRAVELER_WORDS_RE = re.compile(
+    r"\b(?:people|persons?|travell?ers?|adults?|pax|passengers?|kids?|child(?:ren)?|infants?|bab(?:y|ies)"
+    r"|family|friends?|wife|husband|partner|colleagues?|group|with)\b",
+    re.IGNORECASE
+)
+# "from X" / "to Y" directly before a place
+DIRECTION_RE = re.compile(r"\b(from|to)\s+$", re.IGNORECASE)
+ONE_WAY_RE = re.compile(r"\bone[- ]?way\b", re.IGNORECASE)
+# The plain "DEL to BOM" shape, trusted enough to skip the greeting
+ROUTE_RE = re.compile(r"\b([A-Z]{3})\s+to\s+([A-Z]{3})\b")
+# Mentions of a cabin class or a budget, which only the Gemini extraction reads
+CLASS_OR_BUDGET_RE = re.compile(
+    r"\b(?:economy|premium|business|first|class|budget|under|below|max(?:imum)?|omr|rials?|usd|inr)\b|[$€£₹]",
+    re.IGNORECASE
+)
+
+TRIP_FIELDS = (
+    "origin", "destination", "departure_date", "return_date",
+    "travelers", "trip_type", "budget", "class"
+)
+
+# Fields that must be known before searching, in the order we ask for them
+REQUIRED_FIELDS = ("origin", "destination", "departure_date")
+ROUND_TRIP_REQUIRED_FIELDS = REQUIRED_FIELDS + ("return_date",)
+
+# Fields that are identical for every flight-offers search (read-only, since every
+# payload is built from it; orjson writes the tuple as a JSON array)
+FLIGHT_PAYLOAD_TEMPLATE = MappingProxyType({
+    "currencyCode": "OMR",
+    "sources": ("GDS",)
+})
+
+# Rating strings indexed by whole-star rating (0-5)
+STAR_RATINGS = tuple('⭐' * i + '☆' * (5 - i) for i in range(6))
+
+# Traveler lists for the flight payload, indexed by traveler count
+# (Amadeus accepts at most 9 seated travelers per search); traveler_list copies them
+TRAVELERS_BY_COUNT = tuple(
+    tuple(MappingProxyType({"id": str(i+1), "travelerType": "ADULT"}) for i in range(n))
+    for n in range(10)
+)
+
+FIELD_PROMPTS = MappingProxyType({
+    "origin": "Which city are you flying from? (e.g., DEL for Delhi)",
+    "destination": "Where are you flying to? (e.g., MCT for Muscat)",
+    "departure_date": "When are you departing? (YYYY-MM-DD format)",
+    "return_date": "When will you return? (YYYY-MM-DD format)",
+    "travelers": "How many people are traveling?",
+    "budget": "What's your budget (in OMR)?",
+    "class": "Preferred class? (economy/business)"
+})
+
+# Static prompt prefixes, sent as system instructions so only the
+# per-request details vary between calls
+EXTRACTION_INSTRUCTIONS = """Analyze the travel request you are given.
+Extract and return ONLY valid JSON with these fields:
+- origin (IATA code like "DEL" or empty if not mentioned)
+- destination (IATA code like "GOI" or empty)
+- departure_date (YYYY-MM-DD or empty)
+- return_date (YYYY-MM-DD or empty if one-way)
+- travelers (number or default 1)
+- trip_type ("one-way" or "round-trip")
+- budget (number or null)
+- class ("economy", "business" or null)
+
+Example output for "I want to fly from Delhi to Goa on May 5th with 2 people":
+{
+    "origin": "DEL",
+    "destination": "GOI",
+    "departure_date": "2024-05-05",
+    "return_date": "",
+    "travelers": 2,
+    "trip_type": "one-way",
+    "budget": null,
+    "class": "economy"
+}"""
+
+# Response schema for JSON-mode extraction
+TRIP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "origin": {"type": "string"},
+        "destination": {"type": "string"},
+        "departure_date": {"type": "string"},
+        "return_date": {"type": "string"},
+        "travelers": {"type": "integer"},
+        "trip_type": {"type": "string"},
+        "budget": {"type": "number", "nullable": True},
+        "class": {"type": "string", "nullable": True}
+    }
+}
+
+RECOMMENDATION_INSTRUCTIONS = """Provide 3-5 travel recommendations for the destination and dates you are given,
+including attractions, food, and cultural tips in a concise paragraph."""
+
+HEADER_HTML = """
+<div class="header">
+    <h1 style="color:white; margin:0;">✈️ TravelEase Assistant</h1>
+    <p style="color:white; margin:0;">Your personal travel planning companion</p>
+</div>
+"""
+
+CUSTOM_CSS = """
+<style>
+    .main {
+        background-color: #f5f9ff;
+    }
+    .user-message {
+        background-color: #4a8cff;
+        color: white;
+        border-radius: 15px 15px 0 15px;
+        padding: 12px 16px;
+        margin: 8px 0;
+        max-width: 80%;
+        margin-left: auto;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    .assistant-message {
+        background-color: #ffffff;
+        color: #333;
+        border-radius: 15px 15px 15px 0;
+        padding: 12px 16px;
+        margin: 8px 0;
+        max-width: 80%;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        border: 1px solid #e1e1e1;
+    }
+    .stTextInput>div>div>input {
+        color: #333 !important;
+        background-color: white !important;
+        border: 1px solid #ddd !important;
+        border-radius: 20px !important;
+        padding: 10px 15px !important;
+    }
+    .travel-card {
+        border: 1px solid #ddd;
+        border-radius: 10px;
+        padding: 15px;
+        margin: 10px 0;
+        background-color: white;
+        box-shadow: 0 2px 6px rgba(0,0,0,0.05);
+    }
+    .travel-card:hover {
+        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    }
+    .card-row {
+        display: flex;
+        gap: 16px;
+        align-items: flex-start;
+    }
+    .header {
+        background: linear-gradient(135deg, #4a8cff 0%, #2a56d6 100%);
+        color: white;
+        padding: 20px;
+        border-radius: 10px;
+        margin-bottom: 20px;
+    }
+    .price-tag {
+        background-color: #4a8cff;
+        color: white;
+        padding: 5px 10px;
+        border-radius: 15px;
+        font-weight: bold;
+        display: inline-block;
+    }
+    .rating {
+        color: #FFD700;
+        font-size: 18px;
+    }
+    .partner-logo {
+        height: 60px;
+        margin: 10px;
+        filter: grayscale(30%);
+        transition: all 0.3s ease;
+    }
+    .partner-logo:hover {
+        filter: grayscale(0%);
+        transform: scale(1.1);
+    }
+    .logo-container {
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        height: 100px;
+    }
+    .partner {
+        margin: 0 12px;
+        text-align: center;
+        font-size: 0.8em;
+    }
+    .typing-indicator:after {
+        content: '...';
+        animation: typing 1s infinite;
+    }
+    @keyframes typing {
+        0% { content: '.'; }
+        33% { content: '..'; }
+        66% { content: '...'; }
+    }
+    .flight-table {
+        width: 100%;
+        margin: 10px 0;
+    }
+    .flight-table th {
+        text-align: left;
+        padding: 8px;
+        background-color: #f2f2f2;
+    }
+    .flight-table td {
+        padding: 8px;
+        border-bottom: 1px solid #ddd;
+    }
+</style>
+"""